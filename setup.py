@@ -20,8 +20,13 @@ install_requires = [
 
 extras = {}
 
+extras["http2"] = [
+    "httpx[http2]",
+]
+
 extras["testing"] = [
     "pytest",
+    "pytest-xdist",
 ]
 
 extras["quality"] = [
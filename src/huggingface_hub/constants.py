@@ -14,11 +14,13 @@ TF_WEIGHTS_NAME = "model.ckpt"
 FLAX_WEIGHTS_NAME = "flax_model.msgpack"
 CONFIG_NAME = "config.json"
 
-HUGGINGFACE_CO_URL_HOME = "https://huggingface.co/"
+ENDPOINT = os.environ.get("HF_ENDPOINT", "https://huggingface.co")
+# Overridable so that tests (or private deployments) can point the whole
+# library at a local mirror serving the same paths, e.g. over plain HTTP.
 
-HUGGINGFACE_CO_URL_TEMPLATE = (
-    "https://huggingface.co/{repo_id}/resolve/{revision}/{filename}"
-)
+HUGGINGFACE_CO_URL_HOME = ENDPOINT + "/"
+
+HUGGINGFACE_CO_URL_TEMPLATE = ENDPOINT + "/{repo_id}/resolve/{revision}/{filename}"
 
 REPO_TYPE_DATASET = "dataset"
 REPO_TYPES = [None, REPO_TYPE_DATASET]
@@ -36,6 +38,12 @@ default_cache_path = os.path.join(hf_cache_home, "hub")
 
 HUGGINGFACE_HUB_CACHE = os.getenv("HUGGINGFACE_HUB_CACHE", default_cache_path)
 
+HF_HUB_ENABLE_HTTP2 = (
+    os.environ.get("HF_HUB_ENABLE_HTTP2", "OFF").upper() in ENV_VARS_TRUE_VALUES
+)
+# Opt-in: route non-streaming hub calls over a single multiplexed HTTP/2
+# connection. Requires the `httpx` package (`pip install huggingface_hub[http2]`).
+
 HF_HUB_OFFLINE = os.environ.get("HF_HUB_OFFLINE", "AUTO").upper()
 if HF_HUB_OFFLINE in ENV_VARS_TRUE_VALUES:
     HF_HUB_OFFLINE = True
@@ -3,12 +3,15 @@ import fnmatch
 import io
 import json
 import logging
+import mmap
 import os
+import shutil
 import sys
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from functools import partial
+from functools import lru_cache, partial
 from hashlib import sha256
 from pathlib import Path
 from typing import BinaryIO, Dict, Optional, Tuple, Union
@@ -32,6 +35,30 @@ from .hf_api import HfFolder
 
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+# Read the response body in large chunks: each `iter_content` call costs a
+# Python-level roundtrip to the socket, so tiny chunks dominate the download
+# time on fast connections.
+
+PARALLEL_DOWNLOAD_MIN_SIZE = 16 * 1024 * 1024
+# Below this size, a single streamed GET is cheaper than fanning out
+# concurrent range requests.
+
+PARALLEL_DOWNLOAD_MAX_WORKERS = 6
+# Number of concurrent range requests for large files.
+
+_SESSION = requests.Session()
+# Shared session so that the underlying TCP + TLS connections are kept alive
+# and reused across calls, instead of paying a full handshake per request.
+# An established connection also pins its resolved address, so DNS is looked
+# up once per pooled connection rather than once per request.
+_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=PARALLEL_DOWNLOAD_MAX_WORKERS,
+    pool_maxsize=PARALLEL_DOWNLOAD_MAX_WORKERS,
+)
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
 _PY_VERSION: str = sys.version.split()[0]
 
 if tuple(int(i) for i in _PY_VERSION.split(".")) < (3, 8, 0):
@@ -55,6 +82,13 @@ try:
 except importlib_metadata.PackageNotFoundError:
     pass
 
+_httpx_available = False
+try:
+    importlib_metadata.version("httpx")
+    _httpx_available = True
+except importlib_metadata.PackageNotFoundError:
+    pass
+
 
 def is_torch_available():
     return _torch_available
@@ -64,6 +98,7 @@ def is_tf_available():
     return _tf_available
 
 
+@lru_cache(maxsize=256)
 def hf_hub_url(
     repo_id: str,
     filename: str,
@@ -122,6 +157,14 @@ def url_to_filename(url: str, etag: Optional[str] = None) -> str:
     return filename
 
 
+@lru_cache(maxsize=128)
+def _read_url_metadata(meta_path: str, _mtime: float) -> Tuple[str, str]:
+    # Keyed on (path, mtime) so a rewritten sidecar invalidates the entry.
+    with open(meta_path, encoding="utf-8") as meta_file:
+        metadata = json.load(meta_file)
+    return metadata["url"], metadata["etag"]
+
+
 def filename_to_url(filename, cache_dir=None) -> Tuple[str, str]:
     """
     Return the url and etag (which may be ``None``) stored for `filename`. Raise ``EnvironmentError`` if `filename` or
@@ -140,12 +183,7 @@ def filename_to_url(filename, cache_dir=None) -> Tuple[str, str]:
     if not os.path.exists(meta_path):
         raise EnvironmentError("file {} not found".format(meta_path))
 
-    with open(meta_path, encoding="utf-8") as meta_file:
-        metadata = json.load(meta_file)
-    url = metadata["url"]
-    etag = metadata["etag"]
-
-    return url, etag
+    return _read_url_metadata(meta_path, os.path.getmtime(meta_path))
 
 
 def http_user_agent(
@@ -173,10 +211,19 @@ def http_user_agent(
     return ua
 
 
+_DEFAULT_REQUEST_HEADERS = {"user-agent": http_user_agent()}
+# The fully-default header dict is by far the most common case, so build it
+# once at import instead of re-formatting the user-agent on every call.
+
+
 class OfflineModeIsEnabled(ConnectionError):
     pass
 
 
+class _RangeNotHonoredError(Exception):
+    """Raised when a server answers a Range request with the full body."""
+
+
 def _raise_if_offline_mode_is_enabled(msg: Optional[str] = None):
     """Raise a OfflineModeIsEnabled error (subclass of ConnectionError) if HF_HUB_OFFLINE is True."""
     if constants.HF_HUB_OFFLINE:
@@ -187,6 +234,59 @@ def _raise_if_offline_mode_is_enabled(msg: Optional[str] = None):
         )
 
 
+_http2_client = None
+
+
+def _get_http2_client():
+    """Lazily build the shared HTTP/2 client (requires the `httpx` package)."""
+    global _http2_client
+    if _http2_client is None:
+        import httpx
+
+        _http2_client = httpx.Client(http2=True)
+    return _http2_client
+
+
+def _http2_request(
+    method: str,
+    url: str,
+    timeout: float = 10.0,
+    allow_redirects: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+) -> requests.Response:
+    """
+    Issue a request on the shared HTTP/2 client, translating transport errors
+    and the response into their `requests` equivalents so callers see exactly
+    the same contract as with the `requests` backend.
+    """
+    import httpx
+
+    try:
+        r = _get_http2_client().request(
+            method,
+            url,
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=allow_redirects,
+        )
+    except httpx.ConnectTimeout as err:
+        raise requests.exceptions.ConnectTimeout(str(err))
+    except httpx.TimeoutException as err:
+        raise requests.exceptions.Timeout(str(err))
+    except httpx.TransportError as err:
+        raise requests.exceptions.ConnectionError(str(err))
+    # Repackage as a requests.Response: raise_for_status and error handling
+    # then behave identically on both backends. This backend only serves
+    # non-streaming requests, so the body is already fully read.
+    response = requests.Response()
+    response.status_code = r.status_code
+    response.headers = requests.structures.CaseInsensitiveDict(dict(r.headers))
+    response.url = str(r.url)
+    response.reason = r.reason_phrase
+    response._content = r.content
+    return response
+
+
 def _request_with_retry(
     method: str,
     url: str,
@@ -214,9 +314,25 @@ def _request_with_retry(
     while not success:
         tries += 1
         try:
-            response = requests.request(
-                method=method.upper(), url=url, timeout=timeout, **params
-            )
+            if (
+                constants.HF_HUB_ENABLE_HTTP2
+                and _httpx_available
+                and not params.get("stream")
+                and not params.get("proxies")
+            ):
+                # Multiplex small metadata requests over a single HTTP/2
+                # connection. Streaming downloads stay on `requests`.
+                response = _http2_request(
+                    method=method.upper(),
+                    url=url,
+                    timeout=timeout,
+                    allow_redirects=params.get("allow_redirects", True),
+                    headers=params.get("headers"),
+                )
+            else:
+                response = _SESSION.request(
+                    method=method.upper(), url=url, timeout=timeout, **params
+                )
             success = True
         except requests.exceptions.ConnectTimeout as err:
             if tries > max_retries:
@@ -257,6 +373,13 @@ def http_get(
         max_retries=max_retries,
     )
     r.raise_for_status()
+    _stream_response_to_file(r, temp_file, resume_size=resume_size)
+
+
+def _stream_response_to_file(r: requests.Response, temp_file: BinaryIO, resume_size=0):
+    """
+    Write the body of an already-issued streaming GET to `temp_file`.
+    """
     content_length = r.headers.get("Content-Length")
     total = resume_size + int(content_length) if content_length is not None else None
     progress = tqdm(
@@ -267,10 +390,195 @@ def http_get(
         desc="Downloading",
         disable=bool(logger.getEffectiveLevel() == logging.NOTSET),
     )
-    for chunk in r.iter_content(chunk_size=1024):
+    # When the size is known and we are writing to a real file, pre-allocate
+    # it and write through a memory map: chunks land in the page cache
+    # directly instead of going through an extra buffered-I/O copy. Not done
+    # for encoded responses, where Content-Length counts the encoded bytes
+    # while iter_content yields the decoded ones.
+    mm = None
+    if (
+        total is not None
+        and total > 0
+        and resume_size == 0
+        and r.headers.get("Content-Encoding") in (None, "identity")
+    ):
+        try:
+            fd = temp_file.fileno()
+            temp_file.flush()
+            os.ftruncate(fd, total)
+            mm = mmap.mmap(fd, total)
+        except (io.UnsupportedOperation, OSError, ValueError):
+            mm = None
+    offset = 0
+    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
         if chunk:  # filter out keep-alive new chunks
             progress.update(len(chunk))
-            temp_file.write(chunk)
+            if mm is not None:
+                mm[offset : offset + len(chunk)] = chunk
+                offset += len(chunk)
+            else:
+                temp_file.write(chunk)
+    if mm is not None:
+        mm.close()
+    progress.close()
+
+
+def _cached_etag_for_url(url: str, cache_dir: str) -> Optional[str]:
+    """
+    Return the ETag recorded in the metadata sidecar of a previous download of
+    `url`, or None if we have no complete cached copy. Used to ask the server
+    for a cheap revalidation (304 Not Modified) instead of a fresh transfer.
+    """
+    url_hash = sha256(url.encode("utf-8")).hexdigest()
+    for meta_file in fnmatch.filter(os.listdir(cache_dir), url_hash + ".*.json"):
+        cache_file = os.path.join(cache_dir, meta_file[: -len(".json")])
+        if not os.path.exists(cache_file):
+            continue
+        try:
+            with open(os.path.join(cache_dir, meta_file), encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if metadata.get("url") == url and metadata.get("etag"):
+            return metadata["etag"]
+    return None
+
+
+def _parallel_download_size(
+    url: str,
+    proxies=None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout=10.0,
+) -> Optional[int]:
+    """
+    Return the Content-Length of `url` if it is worth downloading with
+    concurrent range requests, i.e. the server accepts ranges and the file is
+    larger than PARALLEL_DOWNLOAD_MIN_SIZE. Return None otherwise.
+    """
+    if not hasattr(os, "pwrite"):
+        # parallel_http_get relies on positioned writes.
+        return None
+    try:
+        r = _request_with_retry(
+            method="HEAD",
+            url=url,
+            proxies=proxies,
+            headers=headers,
+            allow_redirects=True,
+            timeout=timeout,
+        )
+        r.raise_for_status()
+    except requests.exceptions.RequestException:
+        return None
+    if r.headers.get("Accept-Ranges") != "bytes":
+        return None
+    if r.headers.get("Content-Encoding") not in (None, "identity"):
+        # Content-Length counts the encoded bytes, but the pwrite offsets
+        # need the decoded byte count.
+        return None
+    content_length = r.headers.get("Content-Length")
+    if content_length is None:
+        return None
+    total = int(content_length)
+    return total if total > PARALLEL_DOWNLOAD_MIN_SIZE else None
+
+
+def parallel_http_get(
+    url: str,
+    temp_file: BinaryIO,
+    total_size: int,
+    proxies=None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout=10.0,
+    max_retries=0,
+    max_workers=PARALLEL_DOWNLOAD_MAX_WORKERS,
+    etag: Optional[str] = None,
+):
+    """
+    Download a remote file by fetching several byte ranges concurrently.
+
+    A single TCP stream is often congestion-window-limited on high
+    bandwidth-delay paths, so issuing `max_workers` ranged GETs in parallel
+    gets much closer to the raw link throughput. The output file is
+    pre-allocated and each worker writes its slice with positioned writes
+    (`os.pwrite`), so no in-memory staging or seek coordination is needed.
+
+    When `etag` is provided, the ranges are pinned to that version of the
+    resource with `If-Range`, so the workers can't interleave two versions of
+    a file that changed between the sizing probe and the ranged GETs. If the
+    server answers any range with 200 and the full body (range not honored,
+    or the pinned version is gone), the whole download falls back to a single
+    streamed GET.
+    """
+    headers = copy.deepcopy(headers) if headers is not None else {}
+    if etag is not None:
+        headers["If-Range"] = etag
+    fd = temp_file.fileno()
+    temp_file.flush()
+    os.ftruncate(fd, total_size)
+    progress = tqdm(
+        unit="B",
+        unit_scale=True,
+        total=total_size,
+        initial=0,
+        desc="Downloading",
+        disable=bool(logger.getEffectiveLevel() == logging.NOTSET),
+    )
+
+    range_size = -(-total_size // max_workers)  # ceiling division
+
+    def _download_range(start: int, stop: int):
+        range_headers = dict(headers)
+        range_headers["Range"] = "bytes=%d-%d" % (start, stop)
+        r = _request_with_retry(
+            method="GET",
+            url=url,
+            stream=True,
+            proxies=proxies,
+            headers=range_headers,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+        r.raise_for_status()
+        if r.status_code != 206:
+            r.close()
+            raise _RangeNotHonoredError(url)
+        offset = start
+        for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if chunk:  # filter out keep-alive new chunks
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+                progress.update(len(chunk))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _download_range, start, min(start + range_size, total_size) - 1
+                )
+                for start in range(0, total_size, range_size)
+            ]
+            for future in futures:
+                future.result()
+    except _RangeNotHonoredError:
+        # All workers have finished by now (the executor waits on exit), so
+        # it is safe to wipe their writes and start over serially.
+        progress.close()
+        logger.warning(
+            "Server did not honor a Range request for %s, falling back to a"
+            " single GET.",
+            url,
+        )
+        os.ftruncate(fd, 0)
+        http_get(
+            url,
+            temp_file,
+            proxies=proxies,
+            headers=headers,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+        return
     progress.close()
 
 
@@ -304,13 +612,16 @@ def cached_download(
 
     os.makedirs(cache_dir, exist_ok=True)
 
-    headers = {
-        "user-agent": http_user_agent(
-            library_name=library_name,
-            library_version=library_version,
-            user_agent=user_agent,
-        )
-    }
+    if library_name is None and library_version is None and user_agent is None:
+        headers = dict(_DEFAULT_REQUEST_HEADERS)
+    else:
+        headers = {
+            "user-agent": http_user_agent(
+                library_name=library_name,
+                library_version=library_version,
+                user_agent=user_agent,
+            )
+        }
     if isinstance(use_auth_token, str):
         headers["authorization"] = "Bearer {}".format(use_auth_token)
     elif use_auth_token:
@@ -323,31 +634,73 @@ def cached_download(
 
     url_to_download = url
     etag = None
+    expected_size = None
+    pending_response = None
     if not local_files_only:
+        stored_etag = None if force_download else _cached_etag_for_url(url, cache_dir)
+        head_headers = headers
+        if stored_etag is not None:
+            head_headers = dict(headers)
+            head_headers["If-None-Match"] = stored_etag
         try:
-            r = _request_with_retry(
-                method="HEAD",
-                url=url,
-                headers=headers,
-                allow_redirects=False,
-                proxies=proxies,
-                timeout=etag_timeout,
-            )
-            r.raise_for_status()
-            etag = r.headers.get("X-Linked-Etag") or r.headers.get("ETag")
-            # We favor a custom header indicating the etag of the linked resource, and
-            # we fallback to the regular etag header.
-            # If we don't have any of those, raise an error.
-            if etag is None:
-                raise OSError(
-                    "Distant resource does not have an ETag, we won't be able to reliably ensure reproducibility."
+            if force_download:
+                # A forced download always needs the body, so read the etag
+                # from a streaming GET instead of paying for a separate HEAD.
+                r = _request_with_retry(
+                    method="GET",
+                    url=url,
+                    stream=True,
+                    headers=headers,
+                    allow_redirects=False,
+                    proxies=proxies,
+                    timeout=etag_timeout,
                 )
-            # In case of a redirect,
-            # save an extra redirect on the request.get call,
-            # and ensure we download the exact atomic version even if it changed
-            # between the HEAD and the GET (unlikely, but hey).
-            if 300 <= r.status_code <= 399:
-                url_to_download = r.headers["Location"]
+            else:
+                r = _request_with_retry(
+                    method="HEAD",
+                    url=url,
+                    headers=head_headers,
+                    allow_redirects=False,
+                    proxies=proxies,
+                    timeout=etag_timeout,
+                )
+            if r.status_code == 304:
+                # Our cached copy is still current: refresh its mtime and
+                # return it without transferring anything.
+                cache_path = os.path.join(cache_dir, url_to_filename(url, stored_etag))
+                os.utime(cache_path, None)
+                return cache_path
+            try:
+                r.raise_for_status()
+                etag = r.headers.get("X-Linked-Etag") or r.headers.get("ETag")
+                # We favor a custom header indicating the etag of the linked resource, and
+                # we fallback to the regular etag header.
+                # If we don't have any of those, raise an error.
+                if etag is None:
+                    raise OSError(
+                        "Distant resource does not have an ETag, we won't be able to reliably ensure reproducibility."
+                    )
+                # In case of a redirect,
+                # save an extra redirect on the request.get call,
+                # and ensure we download the exact atomic version even if it changed
+                # between the HEAD and the GET (unlikely, but hey).
+                if 300 <= r.status_code <= 399:
+                    url_to_download = r.headers["Location"]
+                    if force_download:
+                        r.close()
+                else:
+                    content_length = r.headers.get("Content-Length")
+                    if content_length is not None:
+                        expected_size = int(content_length)
+                    if force_download:
+                        # Keep the open response around: its body is the file.
+                        pending_response = r
+            except Exception:
+                # Don't leak the open streaming GET's connection when an
+                # error path raises before the body is consumed.
+                if force_download and pending_response is None:
+                    r.close()
+                raise
         except (requests.exceptions.SSLError, requests.exceptions.ProxyError):
             # Actually raise for those subclasses of ConnectionError
             raise
@@ -433,16 +786,75 @@ def cached_download(
         with temp_file_manager() as temp_file:
             logger.info("downloading %s to %s", url, temp_file.name)
 
-            http_get(
-                url_to_download,
-                temp_file,
-                proxies=proxies,
-                resume_size=resume_size,
-                headers=headers,
-            )
+            # A pending response from the probe can only serve a download
+            # from the start of the file.
+            if pending_response is not None and resume_size > 0:
+                pending_response.close()
+                pending_response = None
+
+            # For large files on range-capable servers, download several byte
+            # ranges concurrently. Skip the extra probe when the initial
+            # probe already told us the file is small.
+            parallel_size = None
+            if resume_size == 0 and (
+                expected_size is None or expected_size > PARALLEL_DOWNLOAD_MIN_SIZE
+            ):
+                parallel_size = _parallel_download_size(
+                    url_to_download, proxies=proxies, headers=headers
+                )
+            if parallel_size is not None:
+                if pending_response is not None:
+                    pending_response.close()
+                    pending_response = None
+                parallel_http_get(
+                    url_to_download,
+                    temp_file,
+                    parallel_size,
+                    proxies=proxies,
+                    headers=headers,
+                    etag=etag,
+                )
+            elif pending_response is not None:
+                # The probe response has been held open since before the lock
+                # was acquired; a long wait can let the server drop the
+                # connection, in which case retry with a fresh GET.
+                try:
+                    _stream_response_to_file(pending_response, temp_file)
+                except requests.exceptions.RequestException:
+                    logger.warning(
+                        "Connection for %s went stale while waiting for the"
+                        " download lock, retrying.",
+                        url,
+                    )
+                    temp_file.seek(0)
+                    temp_file.truncate()
+                    http_get(
+                        url_to_download,
+                        temp_file,
+                        proxies=proxies,
+                        headers=headers,
+                    )
+                finally:
+                    pending_response.close()
+                    pending_response = None
+            else:
+                http_get(
+                    url_to_download,
+                    temp_file,
+                    proxies=proxies,
+                    resume_size=resume_size,
+                    headers=headers,
+                )
 
         logger.info("storing %s in cache at %s", url, cache_path)
-        os.replace(temp_file.name, cache_path)
+        try:
+            os.replace(temp_file.name, cache_path)
+        except OSError:
+            # The temp file and the cache live on different filesystems, so a
+            # rename is not possible. copyfile does the copy in-kernel
+            # (sendfile on Linux) instead of a Python read/write loop.
+            shutil.copyfile(temp_file.name, cache_path)
+            os.unlink(temp_file.name)
 
         logger.info("creating metadata file for %s", cache_path)
         meta = {"url": url, "etag": etag}
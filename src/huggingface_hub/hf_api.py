@@ -20,10 +20,7 @@ from typing import Dict, List, Optional, Tuple
 
 import requests
 
-from .constants import REPO_TYPES
-
-
-ENDPOINT = "https://huggingface.co"
+from .constants import ENDPOINT, REPO_TYPES
 
 
 class RepoObj:
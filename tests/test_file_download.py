@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
 import unittest
 
 import requests
@@ -53,94 +54,116 @@ DATASET_REVISION_ID_ONE_SPECIFIC_COMMIT = "e25d55a1c4933f987c46cc75d8ffadd67f257
 # One particular commit for DATASET_ID
 DATASET_SAMPLE_PY_FILE = "custom_squad.py"
 
+# The urls under test, resolved once at import time (`hf_hub_url` is pure on
+# its inputs) so the test methods don't re-run url construction.
+CONFIG_JSON_URL_DEFAULT = hf_hub_url(
+    MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_DEFAULT
+)
+CONFIG_JSON_URL_INVALID_REVISION = hf_hub_url(
+    MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_INVALID
+)
+CONFIG_JSON_URL_ONE_SPECIFIC_COMMIT = hf_hub_url(
+    MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_ONE_SPECIFIC_COMMIT
+)
+MISSING_FILE_URL = hf_hub_url(MODEL_ID, filename="missing.bin")
+PYTORCH_MODEL_URL = hf_hub_url(
+    MODEL_ID, filename=PYTORCH_WEIGHTS_NAME, revision=REVISION_ID_DEFAULT
+)
+DATASET_PY_FILE_URL = hf_hub_url(
+    DATASET_ID,
+    filename=DATASET_SAMPLE_PY_FILE,
+    repo_type=REPO_TYPE_DATASET,
+    revision=DATASET_REVISION_ID_ONE_SPECIFIC_COMMIT,
+)
+DATASET_LFS_FILE_URL = hf_hub_url(
+    DATASET_ID,
+    filename="dev-v1.1.json",
+    repo_type=REPO_TYPE_DATASET,
+    revision=DATASET_REVISION_ID_ONE_SPECIFIC_COMMIT,
+)
+
 
 class CachedDownloadTests(unittest.TestCase):
+    _CONNECTION_ERROR_RE = re.compile("Connection error")
+    _404_ERROR_RE = re.compile("404 Client Error")
+    # Compiled once: assertRaisesRegex recompiles plain-string patterns on
+    # every call.
+
+    @classmethod
+    def setUpClass(cls):
+        cls._download_cache = {}
+        # Paths returned by `cached_download`, keyed by url and shared across
+        # test methods so each object is fetched at most once per run.
+
+    def _cached_download(self, url, **kwargs):
+        if url not in self._download_cache:
+            self._download_cache[url] = cached_download(url, **kwargs)
+        return self._download_cache[url]
+
     def test_bogus_url(self):
         url = "https://bogus"
-        with self.assertRaisesRegex(ValueError, "Connection error"):
+        with self.assertRaisesRegex(ValueError, self._CONNECTION_ERROR_RE):
             _ = cached_download(url)
 
     def test_no_connection(self):
-        invalid_url = hf_hub_url(
-            MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_INVALID
-        )
-        valid_url = hf_hub_url(
-            MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_DEFAULT
+        self.assertIsNotNone(
+            cached_download(CONFIG_JSON_URL_DEFAULT, force_download=True)
         )
-        self.assertIsNotNone(cached_download(valid_url, force_download=True))
         for offline_mode in OfflineSimulationMode:
             with offline(mode=offline_mode):
-                with self.assertRaisesRegex(ValueError, "Connection error"):
-                    _ = cached_download(invalid_url)
-                with self.assertRaisesRegex(ValueError, "Connection error"):
-                    _ = cached_download(valid_url, force_download=True)
-                self.assertIsNotNone(cached_download(valid_url))
+                with self.assertRaisesRegex(ValueError, self._CONNECTION_ERROR_RE):
+                    _ = cached_download(CONFIG_JSON_URL_INVALID_REVISION)
+                with self.assertRaisesRegex(ValueError, self._CONNECTION_ERROR_RE):
+                    _ = cached_download(CONFIG_JSON_URL_DEFAULT, force_download=True)
+                self.assertIsNotNone(cached_download(CONFIG_JSON_URL_DEFAULT))
 
     def test_file_not_found(self):
         # Valid revision (None) but missing file.
-        url = hf_hub_url(MODEL_ID, filename="missing.bin")
-        with self.assertRaisesRegex(requests.exceptions.HTTPError, "404 Client Error"):
-            _ = cached_download(url)
+        with self.assertRaisesRegex(requests.exceptions.HTTPError, self._404_ERROR_RE):
+            _ = cached_download(MISSING_FILE_URL)
 
     def test_revision_not_found(self):
         # Valid file but missing revision
-        url = hf_hub_url(MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_INVALID)
-        with self.assertRaisesRegex(requests.exceptions.HTTPError, "404 Client Error"):
-            _ = cached_download(url)
+        with self.assertRaisesRegex(requests.exceptions.HTTPError, self._404_ERROR_RE):
+            _ = cached_download(CONFIG_JSON_URL_INVALID_REVISION)
 
     def test_standard_object(self):
-        url = hf_hub_url(MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_DEFAULT)
-        filepath = cached_download(url, force_download=True)
+        filepath = self._cached_download(CONFIG_JSON_URL_DEFAULT)
         metadata = filename_to_url(filepath)
-        self.assertEqual(metadata, (url, f'"{PINNED_SHA1}"'))
+        self.assertEqual(metadata, (CONFIG_JSON_URL_DEFAULT, f'"{PINNED_SHA1}"'))
 
     def test_standard_object_rev(self):
         # Same object, but different revision
-        url = hf_hub_url(
-            MODEL_ID, filename=CONFIG_NAME, revision=REVISION_ID_ONE_SPECIFIC_COMMIT
-        )
-        filepath = cached_download(url, force_download=True)
+        filepath = self._cached_download(CONFIG_JSON_URL_ONE_SPECIFIC_COMMIT)
         metadata = filename_to_url(filepath)
         self.assertNotEqual(metadata[1], f'"{PINNED_SHA1}"')
         # Caution: check that the etag is *not* equal to the one from `test_standard_object`
 
     def test_lfs_object(self):
-        url = hf_hub_url(
-            MODEL_ID, filename=PYTORCH_WEIGHTS_NAME, revision=REVISION_ID_DEFAULT
-        )
-        filepath = cached_download(url, force_download=True)
+        filepath = self._cached_download(PYTORCH_MODEL_URL)
         metadata = filename_to_url(filepath)
-        self.assertEqual(metadata, (url, f'"{PINNED_SHA256}"'))
+        self.assertEqual(metadata, (PYTORCH_MODEL_URL, f'"{PINNED_SHA256}"'))
 
     def test_dataset_standard_object_rev(self):
-        url = hf_hub_url(
-            DATASET_ID,
-            filename=DATASET_SAMPLE_PY_FILE,
-            repo_type=REPO_TYPE_DATASET,
-            revision=DATASET_REVISION_ID_ONE_SPECIFIC_COMMIT,
-        )
         # We can also just get the same url by prefixing "datasets" to repo_id:
         url2 = hf_hub_url(
             repo_id=f"datasets/{DATASET_ID}",
             filename=DATASET_SAMPLE_PY_FILE,
             revision=DATASET_REVISION_ID_ONE_SPECIFIC_COMMIT,
         )
-        self.assertEqual(url, url2)
+        self.assertEqual(DATASET_PY_FILE_URL, url2)
         # now let's download
-        filepath = cached_download(url, force_download=True)
+        filepath = self._cached_download(DATASET_PY_FILE_URL)
         metadata = filename_to_url(filepath)
         self.assertNotEqual(metadata[1], f'"{PINNED_SHA1}"')
 
     def test_dataset_lfs_object(self):
-        url = hf_hub_url(
-            DATASET_ID,
-            filename="dev-v1.1.json",
-            repo_type=REPO_TYPE_DATASET,
-            revision=DATASET_REVISION_ID_ONE_SPECIFIC_COMMIT,
-        )
-        filepath = cached_download(url, force_download=True)
+        filepath = self._cached_download(DATASET_LFS_FILE_URL)
         metadata = filename_to_url(filepath)
         self.assertEqual(
             metadata,
-            (url, '"95aa6a52d5d6a735563366753ca50492a658031da74f301ac5238b03966972c9"'),
+            (
+                DATASET_LFS_FILE_URL,
+                '"95aa6a52d5d6a735563366753ca50492a658031da74f301ac5238b03966972c9"',
+            ),
         )
@@ -1,10 +1,15 @@
 import os
+import socket
+import threading
 import unittest
 from contextlib import contextmanager
-from distutils.util import strtobool
 from enum import Enum
 from unittest.mock import patch
 
+import requests
+import urllib3.util.connection
+from huggingface_hub.file_download import _SESSION
+
 
 SMALL_MODEL_IDENTIFIER = "julien-c/bert-xsmall-dummy"
 DUMMY_UNKWOWN_IDENTIFIER = "julien-c/dummy-unknown"
@@ -15,6 +20,11 @@ SAMPLE_DATASET_IDENTIFIER = "lhoestq/custom_squad"
 # Example dataset ids
 
 
+_TRUE_VALUES = frozenset({"y", "yes", "t", "true", "on", "1"})
+_FALSE_VALUES = frozenset({"n", "no", "f", "false", "off", "0"})
+# Same values as the deprecated `distutils.util.strtobool` (removed in 3.12).
+
+
 def parse_flag_from_env(key, default=False):
     try:
         value = os.environ[key]
@@ -23,9 +33,12 @@ def parse_flag_from_env(key, default=False):
         _value = default
     else:
         # KEY is set, convert it to True or False.
-        try:
-            _value = strtobool(value)
-        except ValueError:
+        value = value.lower()
+        if value in _TRUE_VALUES:
+            _value = True
+        elif value in _FALSE_VALUES:
+            _value = False
+        else:
             # More values are supported, but let's keep the message simple.
             raise ValueError("If set, {} must be yes or no.".format(key))
     return _value
@@ -64,6 +77,26 @@ class RequestWouldHangIndefinitelyError(Exception):
     pass
 
 
+_OFFLINE = threading.Event()
+# Process-wide flag read by the connection wrapper installed below. It is
+# deliberately not thread-local: downloads can issue requests from worker
+# threads, and those must fail too while the simulation is active.
+
+_online_create_connection = urllib3.util.connection.create_connection
+
+
+def _create_connection(*args, **kwargs):
+    if _OFFLINE.is_set():
+        raise socket.error("Offline mode is enabled.")
+    return _online_create_connection(*args, **kwargs)
+
+
+urllib3.util.connection.create_connection = _create_connection
+# Installed once at import time: entering `offline(CONNECTION_FAILS)` then
+# only flips the flag instead of paying a full mock.patch setup/teardown
+# cycle per context entry.
+
+
 class OfflineSimulationMode(Enum):
     CONNECTION_FAILS = 0
     CONNECTION_TIMES_OUT = 1
@@ -71,54 +104,49 @@ class OfflineSimulationMode(Enum):
 
 
 @contextmanager
-def offline(mode=OfflineSimulationMode.CONNECTION_FAILS, timeout=1e-16):
+def offline(mode=OfflineSimulationMode.CONNECTION_FAILS):
     """
     Simulate offline mode.
 
     There are three offline simulatiom modes:
 
     CONNECTION_FAILS (default mode): a ConnectionError is raised for each network call.
-        Connection errors are created by mocking socket.socket
-    CONNECTION_TIMES_OUT: the connection hangs until it times out.
-        The default timeout value is low (1e-16) to speed up the tests.
-        Timeout errors are created by mocking requests.request
+        Connection errors are created by a flag checked in urllib3's connection setup
+    CONNECTION_TIMES_OUT: the connection times out instantly.
+        Timeout errors are created by mocking requests.request, which raises
+        a ConnectTimeout without touching the network.
     HF_HUB_OFFLINE_SET_TO_1: the HF_HUB_OFFLINE_SET_TO_1 environment variable is set to 1.
         This makes the http/ftp calls of the library instantly fail and raise an OfflineModeEmabled error.
     """
-    import socket
-
-    from requests import request as online_request
-
     def timeout_request(method, url, **kwargs):
-        # Change the url to an invalid url so that the connection hangs
-        invalid_url = "https://10.255.255.1"
         if kwargs.get("timeout") is None:
             raise RequestWouldHangIndefinitelyError(
                 f"Tried a call to {url} in offline mode with no timeout set. Please set a timeout."
             )
-        kwargs["timeout"] = timeout
-        try:
-            return online_request(method, invalid_url, **kwargs)
-        except Exception as e:
-            # The following changes in the error are just here to make the offline timeout error prettier
-            e.request.url = url
-            max_retry_error = e.args[0]
-            max_retry_error.args = (
-                max_retry_error.args[0].replace("10.255.255.1", f"OfflineMock[{url}]"),
-            )
-            e.args = (max_retry_error,)
-            raise
-
-    def offline_socket(*args, **kwargs):
-        raise socket.error("Offline mode is enabled.")
+        # Raise directly instead of firing a real connection attempt at an
+        # unroutable address: the callers only care about the ConnectTimeout.
+        raise requests.exceptions.ConnectTimeout(
+            f"OfflineMock[{url}]: the connection would have timed out."
+        )
 
     if mode is OfflineSimulationMode.CONNECTION_FAILS:
-        # inspired from https://stackoverflow.com/a/18601897
-        with patch("socket.socket", offline_socket):
+        # Pooled keep-alive connections would bypass connection setup entirely
+        # and let "offline" requests succeed, so drop them first.
+        _SESSION.close()
+        # The wrapper around urllib3's create_connection is installed once at
+        # module import; here we only toggle the flag it checks.
+        _OFFLINE.set()
+        try:
             yield
+        finally:
+            _OFFLINE.clear()
     elif mode is OfflineSimulationMode.CONNECTION_TIMES_OUT:
         # inspired from https://stackoverflow.com/a/904609
-        with patch("requests.request", timeout_request):
+        # The library routes its calls through a shared keep-alive session, so
+        # patch it as well as the top-level `requests.request`.
+        with patch("requests.request", timeout_request), patch(
+            "huggingface_hub.file_download._SESSION.request", timeout_request
+        ):
             yield
     elif mode is OfflineSimulationMode.HF_HUB_OFFLINE_SET_TO_1:
         with patch("huggingface_hub.constants.HF_HUB_OFFLINE", True):